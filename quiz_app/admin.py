@@ -1,10 +1,30 @@
 from django.contrib import admin
-from django.contrib.auth.models import User
-from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from django.db.models import Count, Avg
-from django.utils.html import format_html
+from django.contrib.admin.views.main import ChangeList
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Substr
+from django.utils.html import format_html, format_html_join
+from datetime import timedelta
+from itertools import islice
 from .models import QuizQuestion, UserScore
 
+ONE_SECOND = timedelta(seconds=1)
+
+
+class QuizQuestionChangeList(ChangeList):
+    """Changelist that skips question columns the list never displays"""
+
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        return queryset.defer(
+            'question_text',
+            'choice_a',
+            'choice_b',
+            'choice_c',
+            'choice_d',
+            'updated_at'
+        )
+
 
 @admin.register(QuizQuestion)
 class QuizQuestionAdmin(admin.ModelAdmin):
@@ -39,6 +59,8 @@ class QuizQuestionAdmin(admin.ModelAdmin):
 
     ordering = ('-created_at',)
 
+    list_select_related = ('stats',)
+
     fieldsets = (
         ('Question Information', {
             'fields': ('question_text', 'difficulty_level', 'is_active')
@@ -62,23 +84,22 @@ class QuizQuestionAdmin(admin.ModelAdmin):
 
     def question_preview(self, obj):
         """Show a preview of the question text"""
-        preview = obj.question_text[:100]
-        if len(obj.question_text) > 100:
-            preview += "..."
+        # The annotation holds one extra character to tell if text was cut
+        preview = obj.question_text_preview
+        if len(preview) > 100:
+            return preview[:100] + "..."
         return preview
     question_preview.short_description = "Question Preview"
 
     def question_stats(self, obj):
         """Show statistics for this question"""
-        # Count how many times this question was answered
-        total_attempts = UserScore.objects.filter(
-            quiz_questions__contains=[{'id': obj.id}]
-        ).count()
+        # Totals are maintained as answers are recorded
+        stats = getattr(obj, 'stats', None)
 
-        if total_attempts > 0:
+        if stats and stats.usage_count > 0:
             return format_html(
-                '<span style="color: green;">Used {}</span> times',
-                total_attempts
+                '<span style="color: green;">Used {}</span> times, {} correct',
+                stats.usage_count, stats.correct_count
             )
         else:
             return format_html('<span style="color: orange;">Not used yet</span>')
@@ -86,11 +107,18 @@ class QuizQuestionAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.select_related()
+        return queryset.annotate(
+            question_text_preview=Substr('question_text', 1, 101)
+        )
+
+    def get_changelist(self, request, **kwargs):
+        # Deferring only on the list keeps the change form to a single query
+        return QuizQuestionChangeList
 
     def activate_questions(self, request, queryset):
         """Bulk action to activate selected questions"""
         updated = queryset.update(is_active=True)
+        QuizQuestion.clear_cache()  # update() does not send post_save
         self.message_user(
             request,
             f'{updated} questions were successfully activated.'
@@ -100,6 +128,7 @@ class QuizQuestionAdmin(admin.ModelAdmin):
     def deactivate_questions(self, request, queryset):
         """Bulk action to deactivate selected questions"""
         updated = queryset.update(is_active=False)
+        QuizQuestion.clear_cache()  # update() does not send post_save
         self.message_user(
             request,
             f'{updated} questions were successfully deactivated.'
@@ -108,13 +137,35 @@ class QuizQuestionAdmin(admin.ModelAdmin):
 
     def duplicate_questions(self, request, queryset):
         """Bulk action to duplicate selected questions"""
+        # Copies get higher ids than anything selected; bounding the scan keeps
+        # a chunked read from picking up rows inserted while it is running
+        max_id = QuizQuestion.objects.aggregate(max_id=Max('id'))['max_id']
+        rows = queryset.filter(id__lte=max_id).values(
+            'question_text',
+            'choice_a',
+            'choice_b',
+            'choice_c',
+            'choice_d',
+            'difficulty_level',
+            'correct_answer'
+        ).iterator(chunk_size=500)
+
+        copies = (
+            QuizQuestion(
+                **dict(row, question_text=f"[COPY] {row['question_text']}"),
+                is_active=False  # Deactivate copies by default
+            )
+            for row in rows
+        )
+
         duplicated = 0
-        for question in queryset:
-            question.pk = None  # This will create a new object when saved
-            question.question_text = f"[COPY] {question.question_text}"
-            question.is_active = False  # Deactivate copies by default
-            question.save()
-            duplicated += 1
+        with transaction.atomic():
+            while True:
+                batch = list(islice(copies, 500))
+                if not batch:
+                    break
+                QuizQuestion.objects.bulk_create(batch)
+                duplicated += len(batch)
 
         self.message_user(
             request,
@@ -140,7 +191,7 @@ class UserScoreAdmin(admin.ModelAdmin):
     list_filter = (
         'completed_at',
         'total_questions',
-        'percentage',
+        'grade',
     )
 
     search_fields = (
@@ -152,11 +203,14 @@ class UserScoreAdmin(admin.ModelAdmin):
 
     ordering = ('-completed_at',)
 
+    list_select_related = ('user',)
+
     readonly_fields = (
         'user',
         'score',
         'total_questions', 
         'percentage',
+        'grade',
         'time_taken',
         'completed_at',
         'user_answers_display',
@@ -168,7 +222,7 @@ class UserScoreAdmin(admin.ModelAdmin):
             'fields': ('user', 'completed_at')
         }),
         ('Score Information', {
-            'fields': ('score', 'total_questions', 'percentage', 'time_taken')
+            'fields': ('score', 'total_questions', 'percentage', 'grade', 'time_taken')
         }),
         ('Detailed Results', {
             'fields': ('user_answers_display', 'quiz_questions_display'),
@@ -176,6 +230,20 @@ class UserScoreAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return queryset.select_related('user').only(
+            'id',
+            'user__username',
+            'user__email',
+            'score',
+            'total_questions',
+            'percentage',
+            'grade',
+            'time_taken',
+            'completed_at'
+        )
+
     def score_display(self, obj):
         """Display score as fraction"""
         return f"{obj.score}/{obj.total_questions}"
@@ -185,14 +253,14 @@ class UserScoreAdmin(admin.ModelAdmin):
         """Display percentage with color coding"""
         color = "green" if obj.percentage >= 80 else "orange" if obj.percentage >= 60 else "red"
         return format_html(
-            '<span style="color: {}; font-weight: bold;">{:.1f}%</span>',
-            color, obj.percentage
+            '<span style="color: {}; font-weight: bold;">{}%</span>',
+            color, f"{obj.percentage:.1f}"
         )
     percentage_display.short_description = "Percentage"
 
     def grade_display(self, obj):
         """Display letter grade with color"""
-        grade = obj.get_grade()
+        grade = obj.grade
         color = {
             'A': 'green',
             'B': 'blue', 
@@ -210,38 +278,46 @@ class UserScoreAdmin(admin.ModelAdmin):
     def time_taken_display(self, obj):
         """Display time taken in a readable format"""
         if obj.time_taken:
-            total_seconds = int(obj.time_taken.total_seconds())
-            minutes = total_seconds // 60
-            seconds = total_seconds % 60
+            minutes, seconds = divmod(obj.time_taken // ONE_SECOND, 60)
             return f"{minutes}m {seconds}s"
         return "Not recorded"
     time_taken_display.short_description = "Time Taken"
 
     def user_answers_display(self, obj):
         """Display user answers in a readable format"""
-        if obj.user_answers:
-            answers_html = "<ul>"
-            for question_id, answer in obj.user_answers.items():
-                answers_html += f"<li>Question {question_id}: <strong>{answer}</strong></li>"
-            answers_html += "</ul>"
-            return format_html(answers_html)
+        answers = obj.answers.values_list('question_id', 'chosen')
+        if answers:
+            return format_html(
+                '<ul>{}</ul>',
+                format_html_join(
+                    '',
+                    '<li>Question {}: <strong>{}</strong></li>',
+                    answers
+                )
+            )
         return "No answers recorded"
     user_answers_display.short_description = "User Answers"
 
     def quiz_questions_display(self, obj):
         """Display quiz questions in a readable format"""
-        if obj.quiz_questions:
-            questions_html = "<ol>"
-            for q in obj.quiz_questions:
-                correct_choice = q.get('choices', {}).get(q.get('correct_answer', ''), 'Unknown')
-                questions_html += f"""
-                <li style="margin-bottom: 10px;">
-                    <strong>{q.get('question', 'No question text')}</strong><br>
-                    <small>Correct Answer: {q.get('correct_answer', '?')} - {correct_choice}</small>
-                </li>
-                """
-            questions_html += "</ol>"
-            return format_html(questions_html)
+        answers = obj.answers.select_related('question')
+        if answers:
+            return format_html(
+                '<ol>{}</ol>',
+                format_html_join(
+                    '',
+                    '<li style="margin-bottom: 10px;"><strong>{}</strong><br>'
+                    '<small>Correct Answer: {} - {}</small></li>',
+                    (
+                        (
+                            answer.question.question_text,
+                            answer.question.correct_answer,
+                            answer.question.correct_choice_text
+                        )
+                        for answer in answers
+                    )
+                )
+            )
         return "No questions recorded"
     quiz_questions_display.short_description = "Quiz Questions"
 
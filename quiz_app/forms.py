@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from functools import lru_cache
 from .models import QuizQuestion
 
 class CustomUserCreationForm(UserCreationForm):
@@ -53,50 +54,58 @@ class CustomUserCreationForm(UserCreationForm):
             'placeholder': 'Confirm your password'
         })
 
-    def save(self, commit=True):
-        user = super().save(commit=False)
-        user.email = self.cleaned_data["email"]
-        user.first_name = self.cleaned_data["first_name"]
-        user.last_name = self.cleaned_data["last_name"]
-        if commit:
-            user.save()
-        return user
+
+# Shared by every question field; ChoiceField copies the widget per field
+QUESTION_WIDGET = forms.RadioSelect(attrs={
+    'class': 'form-check-input'
+})
+QUESTION_ERROR_MESSAGES = {'required': 'Please select an answer for this question.'}
 
 
 class QuizForm(forms.Form):
     """Dynamic form for quiz questions"""
 
-    def __init__(self, *args, **kwargs):
-        questions = kwargs.pop('questions', [])
-        super().__init__(*args, **kwargs)
+    # Field name -> question id, filled in on the classes built by for_questions()
+    _question_field_map = {}
 
-        for question in questions:
-            # Create a radio button field for each question
-            choices = [
-                ('A', question.choice_a),
-                ('B', question.choice_b), 
-                ('C', question.choice_c),
-                ('D', question.choice_d),
-            ]
-
-            self.fields[f'question_{question.id}'] = forms.ChoiceField(
-                label=question.question_text,
-                choices=choices,
-                widget=forms.RadioSelect(attrs={
-                    'class': 'form-check-input'
-                }),
-                required=True,
-                error_messages={'required': 'Please select an answer for this question.'}
-            )
+    @classmethod
+    def for_questions(cls, questions):
+        """Return a form class for the questions, reusing classes built before"""
+        return _build_quiz_form_class(tuple(
+            (question.id, question.question_text, question.choices)
+            for question in questions
+        ))
 
     def get_user_answers(self):
         """Extract user answers from cleaned data"""
-        answers = {}
-        for field_name, value in self.cleaned_data.items():
-            if field_name.startswith('question_'):
-                question_id = int(field_name.replace('question_', ''))
-                answers[question_id] = value
-        return answers
+        return {
+            self._question_field_map[field_name]: value
+            for field_name, value in self.cleaned_data.items()
+            if field_name in self._question_field_map
+        }
+
+
+@lru_cache(maxsize=256)
+def _build_quiz_form_class(questions):
+    """Build a QuizForm subclass declaring a radio button field per question
+
+    Cached on the question ids, texts and choices so an edited question
+    never reuses a class built from its old text.
+    """
+    attrs = {
+        f'question_{question_id}': forms.ChoiceField(
+            label=question_text,
+            choices=choices,
+            widget=QUESTION_WIDGET,
+            required=True,
+            error_messages=QUESTION_ERROR_MESSAGES
+        )
+        for question_id, question_text, choices in questions
+    }
+    attrs['_question_field_map'] = {
+        f'question_{question_id}': question_id for question_id, _, _ in questions
+    }
+    return type('QuizForm', (QuizForm,), attrs)
 
 
 class QuizSettingsForm(forms.Form):
@@ -145,7 +154,7 @@ class QuizSettingsForm(forms.Form):
         num_questions = self.cleaned_data['num_questions']
 
         # Check if there are enough questions in the database
-        total_available = QuizQuestion.objects.filter(is_active=True).count()
+        total_available = QuizQuestion.active_count()
 
         if num_questions > total_available:
             raise forms.ValidationError(
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_attempt_questions(apps, schema_editor):
+    """Build attempt/question rows from the JSON stored on existing scores"""
+    QuizQuestion = apps.get_model('quiz_app', 'QuizQuestion')
+    UserScore = apps.get_model('quiz_app', 'UserScore')
+    QuizAttemptQuestion = apps.get_model('quiz_app', 'QuizAttemptQuestion')
+
+    existing_ids = set(QuizQuestion.objects.values_list('id', flat=True))
+    rows = []
+    for user_score in UserScore.objects.only('id', 'quiz_questions').iterator():
+        for question_data in user_score.quiz_questions:
+            question_id = question_data.get('id')
+            if question_id in existing_ids:
+                rows.append(QuizAttemptQuestion(
+                    user_score_id=user_score.id,
+                    question_id=question_id
+                ))
+
+    QuizAttemptQuestion.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizAttemptQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question', models.ForeignKey(help_text='Question that appeared in the quiz attempt', on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='quiz_app.quizquestion')),
+                ('user_score', models.ForeignKey(help_text='Quiz attempt the question appeared in', on_delete=django.db.models.deletion.CASCADE, related_name='attempt_questions', to='quiz_app.userscore')),
+            ],
+            options={
+                'verbose_name': 'Quiz Attempt Question',
+                'verbose_name_plural': 'Quiz Attempt Questions',
+                'unique_together': {('user_score', 'question')},
+            },
+        ),
+        migrations.RunPython(populate_attempt_questions, migrations.RunPython.noop),
+    ]
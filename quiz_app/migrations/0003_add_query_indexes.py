@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0002_quizattemptquestion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizquestion',
+            index=models.Index(fields=['is_active', 'difficulty_level'], name='qq_active_difficulty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizquestion',
+            index=models.Index(fields=['-created_at'], name='qq_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userscore',
+            index=models.Index(fields=['user', '-completed_at'], name='us_user_completed_idx'),
+        ),
+    ]
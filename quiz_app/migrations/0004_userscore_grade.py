@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:01
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+
+def populate_grades(apps, schema_editor):
+    """Grade existing scores in a single UPDATE"""
+    UserScore = apps.get_model('quiz_app', 'UserScore')
+    UserScore.objects.update(grade=Case(
+        When(percentage__gte=90, then=Value('A')),
+        When(percentage__gte=80, then=Value('B')),
+        When(percentage__gte=70, then=Value('C')),
+        When(percentage__gte=60, then=Value('D')),
+        default=Value('F'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0003_add_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userscore',
+            name='grade',
+            field=models.CharField(choices=[('A', 'A'), ('B', 'B'), ('C', 'C'), ('D', 'D'), ('F', 'F')], default='F', editable=False, help_text='Letter grade calculated automatically', max_length=1),
+        ),
+        migrations.RunPython(populate_grades, migrations.RunPython.noop),
+    ]
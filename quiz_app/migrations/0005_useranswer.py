@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_user_answers(apps, schema_editor):
+    """Build answer rows from the JSON stored on existing scores"""
+    QuizQuestion = apps.get_model('quiz_app', 'QuizQuestion')
+    UserScore = apps.get_model('quiz_app', 'UserScore')
+    UserAnswer = apps.get_model('quiz_app', 'UserAnswer')
+
+    correct_answers = dict(QuizQuestion.objects.values_list('id', 'correct_answer'))
+    rows = []
+    for user_score in UserScore.objects.only('id', 'user_answers', 'quiz_questions').iterator():
+        for question_data in user_score.quiz_questions:
+            question_id = question_data.get('id')
+            if question_id not in correct_answers:
+                continue
+            chosen = user_score.user_answers.get(str(question_id), '')
+            rows.append(UserAnswer(
+                score_id=user_score.id,
+                question_id=question_id,
+                chosen=chosen,
+                is_correct=chosen == correct_answers[question_id]
+            ))
+
+    UserAnswer.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0004_userscore_grade'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chosen', models.CharField(blank=True, choices=[('A', 'Choice A'), ('B', 'Choice B'), ('C', 'Choice C'), ('D', 'Choice D')], help_text='Choice selected by the user', max_length=1)),
+                ('is_correct', models.BooleanField(default=False, help_text='Whether the chosen answer was correct')),
+                ('question', models.ForeignKey(help_text='Question that was answered', on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='quiz_app.quizquestion')),
+                ('score', models.ForeignKey(help_text='Quiz attempt the answer belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='quiz_app.userscore')),
+            ],
+            options={
+                'verbose_name': 'User Answer',
+                'verbose_name_plural': 'User Answers',
+                'unique_together': {('score', 'question')},
+            },
+        ),
+        migrations.RunPython(populate_user_answers, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='QuizAttemptQuestion',
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Q
+
+
+def populate_question_stats(apps, schema_editor):
+    """Build question totals from the existing answer rows"""
+    UserAnswer = apps.get_model('quiz_app', 'UserAnswer')
+    QuizQuestionStats = apps.get_model('quiz_app', 'QuizQuestionStats')
+
+    totals = UserAnswer.objects.values('question_id').annotate(
+        usage_count=Count('id'),
+        correct_count=Count('id', filter=Q(is_correct=True))
+    ).order_by()
+    QuizQuestionStats.objects.bulk_create(
+        (QuizQuestionStats(**row) for row in totals.iterator()),
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0005_useranswer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizQuestionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('usage_count', models.IntegerField(default=0, help_text='Number of quiz attempts that included the question')),
+                ('correct_count', models.IntegerField(default=0, help_text='Number of quiz attempts that answered the question correctly')),
+                ('question', models.OneToOneField(help_text='Question the totals belong to', on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='quiz_app.quizquestion')),
+            ],
+            options={
+                'verbose_name': 'Quiz Question Stats',
+                'verbose_name_plural': 'Quiz Question Stats',
+            },
+        ),
+        migrations.RunPython(populate_question_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0006_quizquestionstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userscore',
+            index=models.Index(fields=['-percentage', '-score', '-completed_at'], include=('user', 'total_questions'), name='us_leaderboard_idx'),
+        ),
+    ]
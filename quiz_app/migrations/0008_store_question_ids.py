@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0007_leaderboard_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userscore',
+            name='quiz_questions',
+            field=models.JSONField(default=list, help_text='JSON field storing the ids of the questions in this quiz attempt (older attempts store full question snapshots)'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0008_store_question_ids'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userscore',
+            index=models.Index(fields=['user', '-percentage'], name='us_user_percentage_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-15 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0009_user_percentage_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userscore',
+            name='rendered_results',
+            field=models.JSONField(default=list, editable=False, help_text='JSON field storing the per-question results shown after the quiz'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
+from django.db.models import Case, F, Value, When
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.validators import MinLengthValidator
+from django.utils.functional import cached_property
 
 class QuizQuestion(models.Model):
     """Model for quiz questions with multiple choice answers"""
@@ -47,13 +50,15 @@ class QuizQuestion(models.Model):
         help_text="Select the correct answer"
     )
 
+    DIFFICULTY_CHOICES = [
+        ('EASY', 'Easy'),
+        ('MEDIUM', 'Medium'),
+        ('HARD', 'Hard'),
+    ]
+
     difficulty_level = models.CharField(
         max_length=10,
-        choices=[
-            ('EASY', 'Easy'),
-            ('MEDIUM', 'Medium'),
-            ('HARD', 'Hard'),
-        ],
+        choices=DIFFICULTY_CHOICES,
         default='MEDIUM',
         help_text="Difficulty level of the question"
     )
@@ -66,28 +71,81 @@ class QuizQuestion(models.Model):
         verbose_name = "Quiz Question"
         verbose_name_plural = "Quiz Questions"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'difficulty_level'], name='qq_active_difficulty_idx'),
+            models.Index(fields=['-created_at'], name='qq_created_at_idx'),
+        ]
+
+    ACTIVE_COUNT_CACHE_KEY = 'quizquestion_active_count'
+    ACTIVE_IDS_CACHE_KEY = 'quizquestion_active_ids:{}'
 
     def __str__(self):
         return f"Q{self.id}: {self.question_text[:50]}..."
 
-    def get_choices(self):
-        """Return a list of all choices"""
-        return [
+    @classmethod
+    def active_count(cls):
+        """Return the number of active questions, cached between changes"""
+        return cache.get_or_set(
+            cls.ACTIVE_COUNT_CACHE_KEY,
+            lambda: cls.objects.filter(is_active=True).count(),
+            timeout=60
+        )
+
+    @classmethod
+    def active_ids(cls, difficulty='ALL'):
+        """Return ids of active questions in default order, cached between changes"""
+        def load_ids():
+            queryset = cls.objects.filter(is_active=True)
+            if difficulty != 'ALL':
+                queryset = queryset.filter(difficulty_level=difficulty)
+            return list(queryset.values_list('id', flat=True))
+
+        return cache.get_or_set(
+            cls.ACTIVE_IDS_CACHE_KEY.format(difficulty),
+            load_ids,
+            timeout=60
+        )
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop cached question bank data after questions change"""
+        difficulties = ['ALL'] + [value for value, label in cls.DIFFICULTY_CHOICES]
+        cache.delete_many(
+            [cls.ACTIVE_COUNT_CACHE_KEY] +
+            [cls.ACTIVE_IDS_CACHE_KEY.format(difficulty) for difficulty in difficulties]
+        )
+
+    @cached_property
+    def choices(self):
+        """Return a tuple of all choices"""
+        return (
             ('A', self.choice_a),
             ('B', self.choice_b),
             ('C', self.choice_c),
             ('D', self.choice_d),
-        ]
+        )
 
-    def get_correct_choice_text(self):
+    @cached_property
+    def correct_choice_text(self):
         """Return the text of the correct answer"""
-        choices_map = {
-            'A': self.choice_a,
-            'B': self.choice_b,
-            'C': self.choice_c,
-            'D': self.choice_d,
-        }
-        return choices_map.get(self.correct_answer, '')
+        return dict(self.choices).get(self.correct_answer, '')
+
+
+class UserScoreQuerySet(models.QuerySet):
+    """QuerySet for UserScore that keeps derived fields correct on bulk inserts"""
+
+    def bulk_create(self, objs, batch_size=1000, **kwargs):
+        """Insert scores in batches, filling the fields save() would calculate
+
+        bulk_create skips save() and post_save, so percentage and grade are
+        set here and the leaderboard cache is cleared once afterwards.
+        """
+        objs = list(objs)
+        for obj in objs:
+            obj.calculate_percentage_and_grade()
+        created = super().bulk_create(objs, batch_size=batch_size, **kwargs)
+        self.model.clear_cache()
+        return created
 
 
 class UserScore(models.Model):
@@ -112,6 +170,30 @@ class UserScore(models.Model):
         help_text="Percentage score calculated automatically"
     )
 
+    GRADE_CHOICES = [
+        ('A', 'A'),
+        ('B', 'B'),
+        ('C', 'C'),
+        ('D', 'D'),
+        ('F', 'F'),
+    ]
+
+    # Minimum percentage for each grade, highest first
+    GRADE_THRESHOLDS = [
+        (90, 'A'),
+        (80, 'B'),
+        (70, 'C'),
+        (60, 'D'),
+    ]
+
+    grade = models.CharField(
+        max_length=1,
+        choices=GRADE_CHOICES,
+        default='F',
+        editable=False,
+        help_text="Letter grade calculated automatically"
+    )
+
     time_taken = models.DurationField(
         null=True, 
         blank=True,
@@ -128,38 +210,154 @@ class UserScore(models.Model):
 
     quiz_questions = models.JSONField(
         default=list,
-        help_text="JSON field storing the questions that were in this quiz attempt"
+        help_text="JSON field storing the ids of the questions in this quiz attempt (older attempts store full question snapshots)"
+    )
+
+    rendered_results = models.JSONField(
+        default=list,
+        editable=False,
+        help_text="JSON field storing the per-question results shown after the quiz"
     )
 
     class Meta:
         verbose_name = "User Score"
         verbose_name_plural = "User Scores"
         ordering = ['-completed_at']
+        indexes = [
+            models.Index(fields=['user', '-completed_at'], name='us_user_completed_idx'),
+            models.Index(fields=['user', '-percentage'], name='us_user_percentage_idx'),
+            # INCLUDE makes this covering on PostgreSQL; other backends ignore it
+            models.Index(
+                fields=['-percentage', '-score', '-completed_at'],
+                name='us_leaderboard_idx',
+                include=['user', 'total_questions']
+            ),
+        ]
+
+    objects = UserScoreQuerySet.as_manager()
+
+    TOP_SCORES_CACHE_KEY = 'leaderboard_top_scores'
+    RECENT_HIGH_SCORES_CACHE_KEY = 'leaderboard_recent_high_scores'
 
     def __str__(self):
         return f"{self.user.username} - {self.score}/{self.total_questions} ({self.percentage:.1f}%)"
 
+    @classmethod
+    def clear_cache(cls):
+        """Drop cached leaderboard data after scores change"""
+        cache.delete_many([cls.TOP_SCORES_CACHE_KEY, cls.RECENT_HIGH_SCORES_CACHE_KEY])
+
     def save(self, *args, **kwargs):
-        """Calculate percentage before saving"""
+        """Calculate percentage and grade before saving"""
+        self.calculate_percentage_and_grade()
+        super().save(*args, **kwargs)
+
+    def calculate_percentage_and_grade(self):
+        """Set percentage and grade from score and total_questions"""
         if self.total_questions > 0:
             self.percentage = (self.score / self.total_questions) * 100
         else:
             self.percentage = 0.0
-        super().save(*args, **kwargs)
+        self.grade = self.calculate_grade(self.percentage)
+
+    @classmethod
+    def calculate_grade(cls, percentage):
+        """Return letter grade for a percentage"""
+        for minimum, grade in cls.GRADE_THRESHOLDS:
+            if percentage >= minimum:
+                return grade
+        return 'F'
 
     def get_grade(self):
-        """Return letter grade based on percentage"""
-        if self.percentage >= 90:
-            return 'A'
-        elif self.percentage >= 80:
-            return 'B'
-        elif self.percentage >= 70:
-            return 'C'
-        elif self.percentage >= 60:
-            return 'D'
-        else:
-            return 'F'
+        """Return the stored letter grade"""
+        return self.grade
 
     def is_passed(self):
         """Return True if user passed (60% or above)"""
-        return self.percentage >= 60
\ No newline at end of file
+        return self.percentage >= 60
+
+class UserAnswer(models.Model):
+    """Model storing the answer given to each question of a quiz attempt"""
+
+    score = models.ForeignKey(
+        UserScore,
+        on_delete=models.CASCADE,
+        related_name='answers',
+        help_text="Quiz attempt the answer belongs to"
+    )
+
+    question = models.ForeignKey(
+        QuizQuestion,
+        on_delete=models.CASCADE,
+        related_name='attempts',
+        db_index=True,
+        help_text="Question that was answered"
+    )
+
+    chosen = models.CharField(
+        max_length=1,
+        choices=QuizQuestion.ANSWER_CHOICES,
+        blank=True,
+        help_text="Choice selected by the user"
+    )
+
+    is_correct = models.BooleanField(
+        default=False,
+        help_text="Whether the chosen answer was correct"
+    )
+
+    class Meta:
+        verbose_name = "User Answer"
+        verbose_name_plural = "User Answers"
+        unique_together = ('score', 'question')
+
+    def __str__(self):
+        return f"Attempt {self.score_id} - Q{self.question_id}: {self.chosen or '-'}"
+
+
+class QuizQuestionStats(models.Model):
+    """Model keeping running answer totals for each question"""
+
+    question = models.OneToOneField(
+        QuizQuestion,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        help_text="Question the totals belong to"
+    )
+
+    usage_count = models.IntegerField(
+        default=0,
+        help_text="Number of quiz attempts that included the question"
+    )
+
+    correct_count = models.IntegerField(
+        default=0,
+        help_text="Number of quiz attempts that answered the question correctly"
+    )
+
+    class Meta:
+        verbose_name = "Quiz Question Stats"
+        verbose_name_plural = "Quiz Question Stats"
+
+    def __str__(self):
+        return f"Q{self.question_id}: used {self.usage_count}, correct {self.correct_count}"
+
+    @classmethod
+    def record_answers(cls, answers, delta=1):
+        """Add answers to the totals, or remove them with delta=-1"""
+        question_ids = [answer.question_id for answer in answers]
+        correct_ids = [answer.question_id for answer in answers if answer.is_correct]
+
+        if delta > 0:
+            cls.objects.bulk_create(
+                [cls(question_id=question_id) for question_id in question_ids],
+                ignore_conflicts=True
+            )
+
+        cls.objects.filter(question_id__in=question_ids).update(
+            usage_count=F('usage_count') + delta,
+            correct_count=F('correct_count') + Case(
+                When(question_id__in=correct_ids, then=Value(delta)),
+                default=Value(0)
+            )
+        )
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .models import QuizQuestion, QuizQuestionStats, UserScore
+
+
+@receiver([post_save, post_delete], sender=QuizQuestion)
+def clear_question_cache(sender, **kwargs):
+    """Invalidate cached question data whenever a question changes"""
+    QuizQuestion.clear_cache()
+
+
+@receiver([post_save, post_delete], sender=UserScore)
+def clear_score_cache(sender, **kwargs):
+    """Invalidate cached leaderboard data whenever a score changes"""
+    UserScore.clear_cache()
+
+
+@receiver(pre_delete, sender=UserScore)
+def remove_score_from_question_stats(sender, instance, **kwargs):
+    """Take a deleted attempt's answers out of the question totals
+
+    pre_delete fires once per score, so deleting many scores (or a user)
+    costs one SELECT and one UPDATE per score.
+    """
+    answers = list(instance.answers.only('question_id', 'is_correct'))
+    if answers:
+        QuizQuestionStats.record_answers(answers, delta=-1)
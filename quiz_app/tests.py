@@ -1,3 +1,85 @@
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from importlib import import_module
 
-# Create your tests here.
+from .models import QuizQuestion, QuizQuestionStats, UserAnswer, UserScore
+
+
+class QuizQuestionStatsTests(TestCase):
+    """Running answer totals kept in QuizQuestionStats"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('player', 'player@example.com', 'password')
+        self.questions = [
+            QuizQuestion.objects.create(
+                question_text=f"Sample question number {i}?",
+                choice_a='One',
+                choice_b='Two',
+                choice_c='Three',
+                choice_d='Four',
+                correct_answer='A'
+            )
+            for i in range(3)
+        ]
+
+    def take_quiz(self, chosen):
+        """Submit a quiz choosing chosen[i] for self.questions[i]"""
+        self.client.force_login(self.user)
+        self.client.post(reverse('quiz_setup'), {
+            'num_questions': len(self.questions),
+            'difficulty': 'ALL',
+        })
+        form = self.client.get(reverse('quiz')).context['form']
+        chosen_by_id = {question.id: choice for question, choice in zip(self.questions, chosen)}
+        response = self.client.post(reverse('quiz'), {
+            field_name: chosen_by_id[question_id]
+            for field_name, question_id in form._question_field_map.items()
+        })
+        self.assertRedirects(response, reverse('quiz_results'), fetch_redirect_response=False)
+        return UserScore.objects.latest('id')
+
+    def totals(self):
+        return {
+            stats.question_id: (stats.usage_count, stats.correct_count)
+            for stats in QuizQuestionStats.objects.all()
+        }
+
+    def test_submit_records_usage_and_correct_counts(self):
+        self.take_quiz(['A', 'B', 'A'])
+        self.take_quiz(['A', 'A', 'C'])
+
+        first, second, third = (question.id for question in self.questions)
+        self.assertEqual(self.totals(), {first: (2, 2), second: (2, 1), third: (2, 1)})
+
+    def test_deleting_score_removes_its_answers(self):
+        self.take_quiz(['A', 'B', 'A'])
+        user_score = self.take_quiz(['A', 'A', 'C'])
+
+        user_score.delete()
+
+        first, second, third = (question.id for question in self.questions)
+        self.assertEqual(self.totals(), {first: (1, 1), second: (1, 0), third: (1, 1)})
+
+    def test_deleting_user_removes_all_their_answers(self):
+        self.take_quiz(['A', 'B', 'A'])
+        self.take_quiz(['A', 'A', 'C'])
+
+        self.user.delete()
+
+        self.assertFalse(UserAnswer.objects.exists())
+        self.assertEqual(set(self.totals().values()), {(0, 0)})
+
+    def test_migration_backfill_matches_submitted_totals(self):
+        self.take_quiz(['A', 'B', 'A'])
+        self.take_quiz(['A', 'A', 'C'])
+        expected = self.totals()
+
+        QuizQuestionStats.objects.all().delete()
+        migration = import_module('quiz_app.migrations.0006_quizquestionstats')
+        migration.populate_question_stats(apps, None)
+
+        self.assertEqual(self.totals(), expected)
@@ -3,17 +3,17 @@ from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView
 from django.contrib import messages
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.urls import reverse_lazy
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import TemplateView
-from django.utils import timezone
-from django.db.models import Q, Avg, Count
-from datetime import datetime, timedelta
-import json
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Sum
+from datetime import timedelta
 import random
+import time
 
-from .models import QuizQuestion, UserScore
+from .models import QuizQuestion, QuizQuestionStats, UserScore, UserAnswer
 from .forms import CustomUserCreationForm, QuizForm, QuizSettingsForm
 
 
@@ -25,16 +25,23 @@ class HomeView(TemplateView):
         context = super().get_context_data(**kwargs)
 
         # Get some statistics for the home page
-        context['total_questions'] = QuizQuestion.objects.filter(is_active=True).count()
+        context['total_questions'] = QuizQuestion.active_count()
 
         if self.request.user.is_authenticated:
             user_scores = UserScore.objects.filter(user=self.request.user)
-            context['user_attempts'] = user_scores.count()
+            stats = user_scores.aggregate(
+                attempts=Count('id'),
+                best_score=Max('percentage'),
+                average_score=Avg('percentage')
+            )
+            context['user_attempts'] = stats['attempts']
 
-            if user_scores.exists():
-                context['best_score'] = user_scores.order_by('-percentage').first()
-                context['average_score'] = user_scores.aggregate(avg=Avg('percentage'))['avg']
-                context['recent_scores'] = user_scores.order_by('-completed_at')[:5]
+            if stats['attempts']:
+                context['best_score'] = stats['best_score']
+                context['average_score'] = stats['average_score']
+                context['recent_scores'] = user_scores.only(
+                    'score', 'total_questions', 'percentage', 'grade', 'time_taken', 'completed_at'
+                ).order_by('-completed_at')[:5]
 
         return context
 
@@ -86,7 +93,7 @@ def quiz_setup_view(request):
     else:
         form = QuizSettingsForm()
 
-    total_questions = QuizQuestion.objects.filter(is_active=True).count()
+    total_questions = QuizQuestion.active_count()
 
     return render(request, 'quiz_setup.html', {
         'form': form,
@@ -105,76 +112,92 @@ def quiz_view(request):
         'random_order': True
     })
 
-    # Build query for questions
-    questions_query = QuizQuestion.objects.filter(is_active=True)
+    # Pick question ids when the quiz loads and keep them in the session so
+    # the submitted answers are checked against the questions that were shown
+    question_ids = request.session.get('quiz_question_ids') if request.method == 'POST' else None
+    if not question_ids:
+        available_ids = QuizQuestion.active_ids(quiz_settings['difficulty'])
+        num_questions = min(quiz_settings['num_questions'], len(available_ids))
+        if quiz_settings['random_order']:
+            question_ids = random.sample(available_ids, num_questions)
+        else:
+            question_ids = available_ids[:num_questions]
+        request.session['quiz_question_ids'] = question_ids
 
-    if quiz_settings['difficulty'] != 'ALL':
-        questions_query = questions_query.filter(difficulty_level=quiz_settings['difficulty'])
-
-    # Get questions
-    if quiz_settings['random_order']:
-        questions = list(questions_query.order_by('?')[:quiz_settings['num_questions']])
-    else:
-        questions = list(questions_query[:quiz_settings['num_questions']])
+    # Get questions, keeping the selected order; only the columns used to
+    # build the form, grade answers and render results are loaded
+    questions_by_id = QuizQuestion.objects.only(
+        'id', 'question_text', 'choice_a', 'choice_b', 'choice_c', 'choice_d', 'correct_answer'
+    ).in_bulk(question_ids)
+    questions = [questions_by_id[pk] for pk in question_ids if pk in questions_by_id]
 
     if not questions:
         messages.error(request, 'No questions available for the selected criteria.')
         return redirect('quiz_setup')
 
+    form_class = QuizForm.for_questions(questions)
+
     if request.method == 'POST':
-        form = QuizForm(request.POST, questions=questions)
+        form = form_class(request.POST)
         if form.is_valid():
             # Store start time if not already stored
             if 'quiz_start_time' not in request.session:
-                request.session['quiz_start_time'] = timezone.now().isoformat()
+                request.session['quiz_start_time'] = time.time()
 
-            # Calculate score
+            # Grade each answer once; the score is derived from the graded rows
             user_answers = form.get_user_answers()
-            score = 0
-            correct_answers = {}
-
+            answers = []
             for question in questions:
-                correct_answers[question.id] = question.correct_answer
-                if user_answers.get(question.id) == question.correct_answer:
-                    score += 1
-
-            # Calculate time taken
-            start_time_str = request.session.get('quiz_start_time')
-            if start_time_str:
-                start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                time_taken = timezone.now() - start_time.replace(tzinfo=timezone.utc)
+                chosen = user_answers.get(question.id, '')
+                answers.append(UserAnswer(
+                    question=question,
+                    chosen=chosen,
+                    is_correct=chosen == question.correct_answer
+                ))
+            score = sum(answer.is_correct for answer in answers)
+
+            # Calculate time taken (sessions from before epoch timestamps hold a string)
+            start_time = request.session.get('quiz_start_time')
+            if isinstance(start_time, (int, float)):
+                time_taken = timedelta(seconds=time.time() - start_time)
             else:
                 time_taken = None
 
-            # Save score to database
-            user_score = UserScore.objects.create(
-                user=request.user,
-                score=score,
-                total_questions=len(questions),
-                time_taken=time_taken,
-                user_answers=user_answers,
-                quiz_questions=[{
-                    'id': q.id,
-                    'question': q.question_text,
-                    'choices': dict(q.get_choices()),
-                    'correct_answer': q.correct_answer
-                } for q in questions]
-            )
-
-            # Store result in session and redirect to results
+            # Save score, answers and question stats in one transaction
+            with transaction.atomic():
+                user_score = UserScore.objects.create(
+                    user=request.user,
+                    score=score,
+                    total_questions=len(questions),
+                    time_taken=time_taken,
+                    user_answers=user_answers,
+                    quiz_questions=[question.id for question in questions],
+                    rendered_results=[
+                        _build_result(
+                            question.question_text,
+                            dict(question.choices),
+                            question.correct_answer,
+                            user_answers.get(question.id, 'Not answered')
+                        )
+                        for question in questions
+                    ]
+                )
+                for answer in answers:
+                    answer.score = user_score
+                UserAnswer.objects.bulk_create(answers)
+                QuizQuestionStats.record_answers(answers)
+
+            # Store result in session and clear quiz session data; the
+            # session is saved once when the response is sent
             request.session['quiz_result_id'] = user_score.id
-
-            # Clear quiz session data
-            if 'quiz_start_time' in request.session:
-                del request.session['quiz_start_time']
-            if 'quiz_settings' in request.session:
-                del request.session['quiz_settings']
+            for key in ('quiz_start_time', 'quiz_settings', 'quiz_question_ids'):
+                request.session.pop(key, None)
 
             return redirect('quiz_results')
     else:
         # Store start time when quiz loads
-        request.session['quiz_start_time'] = timezone.now().isoformat()
-        form = QuizForm(questions=questions)
+        request.session['quiz_start_time'] = time.time()
+        form = form_class()
 
     context = {
         'form': form,
@@ -186,6 +209,19 @@ def quiz_view(request):
     return render(request, 'quiz.html', context)
 
 
+def _build_result(question_text, choices, correct_answer, user_answer):
+    """Return the result details shown for one answered question"""
+    return {
+        'question': question_text,
+        'choices': choices,
+        'user_answer': user_answer,
+        'correct_answer': correct_answer,
+        'is_correct': user_answer == correct_answer,
+        'correct_text': choices.get(correct_answer, 'Unknown'),
+        'user_text': choices.get(user_answer, 'Not answered')
+    }
+
+
 @login_required 
 def quiz_results_view(request):
     """Quiz results view"""
@@ -195,24 +231,38 @@ def quiz_results_view(request):
         messages.error(request, 'No quiz results found. Please take a quiz first.')
         return redirect('home')
 
-    user_score = get_object_or_404(UserScore, id=result_id, user=request.user)
-
-    # Prepare detailed results
-    detailed_results = []
-    for question_data in user_score.quiz_questions:
-        question_id = question_data['id']
-        user_answer = user_score.user_answers.get(str(question_id), 'Not answered')
-        correct_answer = question_data['correct_answer']
-
-        detailed_results.append({
-            'question': question_data['question'],
-            'choices': question_data['choices'],
-            'user_answer': user_answer,
-            'correct_answer': correct_answer,
-            'is_correct': user_answer == correct_answer,
-            'correct_text': question_data['choices'].get(correct_answer, 'Unknown'),
-            'user_text': question_data['choices'].get(user_answer, 'Not answered')
-        })
+    user_score = get_object_or_404(
+        UserScore.objects.only(
+            'id', 'user_id', 'score', 'total_questions', 'percentage', 'grade', 'time_taken', 'rendered_results'
+        ),
+        id=result_id,
+        user=request.user
+    )
+
+    # Detailed results are rendered once when the quiz is submitted
+    detailed_results = user_score.rendered_results
+    if not detailed_results:
+        # Scores saved before results were stored hold question ids, or full
+        # question snapshots for the oldest attempts (the answer columns are
+        # deferred and only loaded on this path)
+        questions_by_id = QuizQuestion.objects.in_bulk([
+            entry for entry in user_score.quiz_questions if not isinstance(entry, dict)
+        ])
+        get_user_answer = user_score.user_answers.get
+        detailed_results = []
+        for entry in user_score.quiz_questions:
+            if isinstance(entry, dict):
+                question_id = entry['id']
+                question_text, choices, correct_answer = entry['question'], entry['choices'], entry['correct_answer']
+            elif entry in questions_by_id:
+                question = questions_by_id[entry]
+                question_id = question.id
+                question_text, choices, correct_answer = question.question_text, dict(question.choices), question.correct_answer
+            else:
+                continue  # Question was deleted after the attempt
+            detailed_results.append(_build_result(
+                question_text, choices, correct_answer, get_user_answer(str(question_id), 'Not answered')
+            ))
 
     context = {
         'user_score': user_score,
@@ -223,8 +273,7 @@ def quiz_results_view(request):
     }
 
     # Clear the result from session after displaying
-    if 'quiz_result_id' in request.session:
-        del request.session['quiz_result_id']
+    request.session.pop('quiz_result_id', None)
 
     return render(request, 'results.html', context)
 
@@ -234,21 +283,33 @@ def user_history_view(request):
     """View user's quiz history"""
     user_scores = UserScore.objects.filter(user=request.user).order_by('-completed_at')
 
-    # Calculate statistics
-    total_attempts = user_scores.count()
+    # Calculate statistics in a single query
+    stats = user_scores.aggregate(
+        total_attempts=Count('id'),
+        best_score=Max('percentage'),
+        average_score=Avg('percentage'),
+        total_questions_answered=Sum('total_questions'),
+        total_correct_answers=Sum('score')
+    )
+    total_attempts = stats['total_attempts']
     if total_attempts > 0:
-        best_score = user_scores.order_by('-percentage').first()
-        average_score = user_scores.aggregate(avg=Avg('percentage'))['avg']
-        total_questions_answered = sum(score.total_questions for score in user_scores)
-        total_correct_answers = sum(score.score for score in user_scores)
+        best_score = stats['best_score']
+        average_score = stats['average_score']
+        total_questions_answered = stats['total_questions_answered']
+        total_correct_answers = stats['total_correct_answers']
     else:
         best_score = None
         average_score = 0
         total_questions_answered = 0
         total_correct_answers = 0
 
+    page = Paginator(
+        user_scores.only('score', 'total_questions', 'percentage', 'grade', 'time_taken', 'completed_at'),
+        25
+    ).get_page(request.GET.get('page'))
+
     context = {
-        'user_scores': user_scores,
+        'user_scores': page,
         'total_attempts': total_attempts,
         'best_score': best_score,
         'average_score': round(average_score, 1) if average_score else 0,
@@ -263,19 +324,31 @@ def user_history_view(request):
 @login_required
 def leaderboard_view(request):
     """Leaderboard showing top performers"""
-    # Get top scores (best attempt per user)
-    from django.db.models import Max
-
-    top_scores = UserScore.objects.values('user__username', 'user__first_name', 'user__last_name').annotate(
-        best_score=Max('percentage'),
-        total_attempts=Count('id'),
-        avg_score=Avg('percentage')
-    ).order_by('-best_score')[:20]
+    # Get top scores (best attempt per user); cached until a score changes
+    top_scores = cache.get_or_set(
+        UserScore.TOP_SCORES_CACHE_KEY,
+        lambda: list(UserScore.objects.values('user__username', 'user__first_name', 'user__last_name').annotate(
+            best_score=Max('percentage'),
+            total_attempts=Count('id'),
+            avg_score=Avg('percentage')
+        ).order_by('-best_score')[:20]),
+        timeout=60
+    )
 
     # Recent high scores
-    recent_high_scores = UserScore.objects.filter(
-        percentage__gte=80
-    ).select_related('user').order_by('-completed_at')[:10]
+    recent_high_scores = cache.get_or_set(
+        UserScore.RECENT_HIGH_SCORES_CACHE_KEY,
+        lambda: list(UserScore.objects.filter(
+            percentage__gte=80
+        ).select_related('user').only(
+            'score',
+            'total_questions',
+            'percentage',
+            'completed_at',
+            'user__username'
+        ).order_by('-completed_at')[:10]),
+        timeout=60
+    )
 
     context = {
         'top_scores': top_scores,
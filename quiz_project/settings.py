@@ -82,6 +82,35 @@ DATABASES = {
     }
 }
 
+# The leaderboard index INCLUDEs extra columns to be covering on PostgreSQL;
+# SQLite ignores them, which is harmless, so don't warn about it
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# Set REDIS_URL (e.g. redis://127.0.0.1:6379/0) to share the cache between workers
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+    # Read sessions from the shared cache and write them through to the database.
+    # Not enabled for the local-memory cache, which is not shared between processes.
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators